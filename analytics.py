@@ -0,0 +1,199 @@
+import os
+import glob
+import json
+
+import pandas as pd
+
+from early_stopping import get_skill_area
+from question_similarity import normalize_question
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+class AnalyticsConfig:
+    """Cross-interview analytics settings"""
+    RESULTS_DIR = 'interview_results'
+    STORE_DIR = os.path.join('interview_results', 'analytics')
+    MANIFEST = 'manifest.json'
+    COMPACT_AFTER_PARTS = 20
+
+# Columns of the per-question table, one row per answered question
+QUESTION_COLUMNS = [
+    'interview_id', 'question_index', 'question', 'question_key', 'topic',
+    'answer_words', 'relevance_score', 'bleu_score', 'turn_latency_s'
+]
+
+def _manifest_path(store_dir):
+    return os.path.join(store_dir, AnalyticsConfig.MANIFEST)
+
+def load_manifest(store_dir=AnalyticsConfig.STORE_DIR):
+    """Return the set of result files already ingested"""
+    path = _manifest_path(store_dir)
+    if not os.path.exists(path):
+        return set()
+    with open(path) as f:
+        return set(json.load(f))
+
+def save_manifest(ingested, store_dir=AnalyticsConfig.STORE_DIR):
+    with open(_manifest_path(store_dir), 'w') as f:
+        json.dump(sorted(ingested), f)
+
+def result_to_rows(results, interview_id):
+    """Flatten one saved interview into per-question rows"""
+    scores = results.get('scores', [])
+    latencies = results.get('turn_latencies', [])
+    rows = []
+    for i, (question, answer) in enumerate(zip(results.get('questions', []), results.get('answers', []))):
+        score = scores[i] if i < len(scores) else {}
+        rows.append({
+            'interview_id': interview_id,
+            'question_index': i + 1,
+            'question': question,
+            'question_key': normalize_question(question),
+            'topic': get_skill_area(question, answer),
+            'answer_words': len(answer.split()),
+            'relevance_score': score.get('relevance_score'),
+            'bleu_score': score.get('bleu_score'),
+            'turn_latency_s': latencies[i] if i < len(latencies) else None
+        })
+    return rows
+
+def is_finished_result(results):
+    """Only completed interviews are ingested; in-progress files are still being rewritten"""
+    if 'interview_complete' in results:
+        return bool(results['interview_complete'])
+    # Files saved before the flag existed count as finished once they have feedback
+    return bool(results.get('feedback'))
+
+def ingest_results(results_dir=AnalyticsConfig.RESULTS_DIR, store_dir=AnalyticsConfig.STORE_DIR):
+    """
+    Add newly completed interviews to the columnar store as one Parquet part file.
+    Returns:
+        int: Number of interviews ingested
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    ingested = load_manifest(store_dir)
+    rows = []
+    new_files = []
+
+    for path in sorted(glob.glob(os.path.join(results_dir, 'interview_*.json'))):
+        name = os.path.basename(path)
+        if name in ingested:
+            continue
+        try:
+            with open(path) as f:
+                results = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error reading {path}: {e}")
+            continue
+        if not is_finished_result(results):
+            continue
+        # Files saved before interview_id existed are keyed by their start second
+        rows.extend(result_to_rows(results, results.get('interview_id') or results.get('timestamp') or name))
+        new_files.append(name)
+
+    if not new_files:
+        return 0
+
+    frame = pd.DataFrame(rows, columns=QUESTION_COLUMNS)
+    parts = list_parts(store_dir)
+    # Number after the highest existing part; counting files could reuse a name left by a crash
+    part = part_number(parts[-1]) + 1 if parts else 0
+    frame.to_parquet(os.path.join(store_dir, f'part-{part:05d}.parquet'), index=False)
+    save_manifest(ingested | set(new_files), store_dir)
+
+    if len(parts) + 1 >= AnalyticsConfig.COMPACT_AFTER_PARTS:
+        compact_store(store_dir)
+    return len(new_files)
+
+def list_parts(store_dir=AnalyticsConfig.STORE_DIR):
+    return sorted(glob.glob(os.path.join(store_dir, 'part-*.parquet')), key=part_number)
+
+def part_number(path):
+    return int(os.path.basename(path)[len('part-'):-len('.parquet')])
+
+def drop_duplicate_rows(frame):
+    """Rows repeat only if a compaction was interrupted before it removed the merged parts"""
+    return frame.drop_duplicates(subset=['interview_id', 'question_index'], ignore_index=True)
+
+def compact_store(store_dir=AnalyticsConfig.STORE_DIR):
+    """
+    Merge all part files into one so scans open a single file.
+    The merged file replaces part-00000 before any other part is deleted, so a crash at any
+    point leaves every row readable; at worst some rows are duplicated until the next compaction.
+    """
+    parts = list_parts(store_dir)
+    if len(parts) < 2:
+        return
+    merged = drop_duplicate_rows(pd.concat([pd.read_parquet(p) for p in parts], ignore_index=True))
+    tmp_path = os.path.join(store_dir, 'compacted.tmp')
+    merged.to_parquet(tmp_path, index=False)
+    target = os.path.join(store_dir, 'part-00000.parquet')
+    os.replace(tmp_path, target)
+    for p in parts:
+        if os.path.abspath(p) != os.path.abspath(target):
+            os.remove(p)
+
+def load_question_frame(store_dir=AnalyticsConfig.STORE_DIR):
+    """Load the per-question table, scanning with DuckDB when it is installed"""
+    pattern = os.path.join(store_dir, 'part-*.parquet')
+    if not glob.glob(pattern):
+        return pd.DataFrame(columns=QUESTION_COLUMNS)
+    if duckdb is not None:
+        return drop_duplicate_rows(duckdb.query(f"SELECT * FROM read_parquet('{pattern}')").df())
+    return drop_duplicate_rows(pd.concat([pd.read_parquet(p) for p in list_parts(store_dir)], ignore_index=True))
+
+def score_buckets(scores):
+    """Vectorized Excellent/Good/Needs Work labels, matching visualization thresholds"""
+    return pd.cut(scores, bins=[float('-inf'), 60, 80, float('inf')], right=False,
+                  labels=["Needs Work", "Good", "Excellent"])
+
+def score_distribution_by_topic(frame):
+    """Score statistics and bucket counts per topic"""
+    scored = frame.dropna(subset=['relevance_score'])
+    if scored.empty:
+        return pd.DataFrame()
+    stats = scored.groupby('topic')['relevance_score'].agg(
+        answers='count', mean='mean', median='median', p90=lambda s: s.quantile(0.9)
+    )
+    buckets = pd.crosstab(scored['topic'], score_buckets(scored['relevance_score']))
+    return stats.join(buckets).sort_values('answers', ascending=False)
+
+def question_effectiveness(frame, min_asked=2):
+    """How well each recurring question draws relevant, substantive answers"""
+    scored = frame.dropna(subset=['relevance_score'])
+    if scored.empty:
+        return pd.DataFrame()
+    grouped = scored.groupby('question_key').agg(
+        question=('question', 'first'),
+        times_asked=('interview_id', 'count'),
+        mean_score=('relevance_score', 'mean'),
+        score_std=('relevance_score', 'std'),
+        mean_answer_words=('answer_words', 'mean')
+    )
+    grouped = grouped[grouped['times_asked'] >= min_asked]
+    return grouped.sort_values('mean_score', ascending=False).reset_index(drop=True)
+
+def latency_by_question_index(frame):
+    """Turn latency percentiles by position in the interview"""
+    timed = frame.dropna(subset=['turn_latency_s'])
+    if timed.empty:
+        return pd.DataFrame()
+    return timed.groupby('question_index')['turn_latency_s'].quantile([0.5, 0.95]).unstack().rename(
+        columns={0.5: 'p50_s', 0.95: 'p95_s'}
+    )
+
+def overall_summary(frame):
+    """Headline numbers for the dashboard"""
+    scores = frame['relevance_score'].dropna()
+    buckets = score_buckets(scores).value_counts()
+    return {
+        'interviews': frame['interview_id'].nunique(),
+        'answers': len(frame),
+        'average': round(float(scores.mean()), 1) if len(scores) else 0,
+        'excellent': int(buckets.get("Excellent", 0)),
+        'good': int(buckets.get("Good", 0)),
+        'needs_improvement': int(buckets.get("Needs Work", 0))
+    }
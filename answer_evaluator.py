@@ -1,8 +1,9 @@
 import time
 
 from model import infer_with_retry
-from nltk.translate.bleu_score import sentence_bleu  # Import BLEU score
+from tracing import traced
 
+@traced('calculate_relevance_score')
 def calculate_relevance_score(question, answer, resume_context=""):
     """
     Calculate how relevant an answer is to the question asked.
@@ -57,6 +58,8 @@ def calculate_relevance_score(question, answer, resume_context=""):
 
          # --- Add BLEU Score Calculation ---
         try:
+            # NLTK is imported on first use to keep it off the startup path
+            from nltk.translate.bleu_score import sentence_bleu
             reference = question.split()  # Tokenize question (reference)
             candidate = answer.split()  # Tokenize answer (candidate)
             bleu_score = sentence_bleu([reference], candidate)
@@ -85,9 +88,11 @@ def calculate_relevance_score(question, answer, resume_context=""):
             "feedback": "Error calculating score. Please check logs.",
             "strengths": ["Unable to determine"],
             "areas_for_improvement": ["Unable to determine"],
-            "bleu_score": None  # Added for consistency
+            "bleu_score": None,  # Added for consistency
+            "error": True  # Fallback, not a real assessment of the answer
         }
 
+@traced('evaluate_overall_interview')
 def evaluate_overall_interview(questions, answers, resume_text=""):
     """
     Evaluate the overall quality of an interview across all Q&A pairs.
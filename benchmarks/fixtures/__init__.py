@@ -0,0 +1,62 @@
+import os
+import json
+import math
+import wave
+import struct
+
+FIXTURES_DIR = os.path.dirname(os.path.abspath(__file__))
+
+RESUME_LINES = [
+    "Jane Doe - Backend Engineer",
+    "Skills: Python, Docker, AWS, PostgreSQL, Kafka",
+    "Acme Corp (2019-2024): built a realtime analytics pipeline and cut p95 latency by 40%.",
+    "Projects: inventory forecasting service, internal deployment tooling.",
+    "Mentored four junior engineers and led the on-call rotation."
+]
+
+def load_json_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name)) as f:
+        return json.load(f)
+
+def build_resume_pdf(lines=RESUME_LINES):
+    """Build a minimal single-page PDF with one line of text per entry"""
+    text_ops = ["BT", "/F1 11 Tf", "50 750 Td", "14 TL"]
+    for line in lines:
+        escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+        text_ops.append(f"({escaped}) Tj T*")
+    text_ops.append("ET")
+    stream = "\n".join(text_ops).encode("latin-1")
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        b"/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>",
+        b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+    ]
+
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref_offset = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        pdf += f"{offset:010d} 00000 n \n".encode()
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+    return pdf
+
+def build_answer_wav(path, seconds=3.0, sample_rate=16000, frequency=220.0):
+    """Write a mono 16-bit WAV test tone, the size of a short spoken answer"""
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        frames = b"".join(
+            struct.pack('<h', int(8000 * math.sin(2 * math.pi * frequency * i / sample_rate)))
+            for i in range(int(seconds * sample_rate))
+        )
+        wav.writeframes(frames)
+    return path
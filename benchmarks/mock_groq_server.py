@@ -0,0 +1,148 @@
+"""
+Local stand-in for the Groq (OpenAI-compatible) chat completions endpoint.
+Replies come from recorded responses, with configurable latency and error injection.
+
+Usage:
+    python -m benchmarks.mock_groq_server --port 8765 --latency 0.3 --error-rate 0.1
+    GROQ_BASE_URL=http://127.0.0.1:8765 GROQ_API_KEY=test streamlit run main.py
+"""
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.fixtures import load_json_fixture
+
+class MockServerConfig:
+    """Default behaviour of the mock server"""
+    LATENCY = 0.2
+    JITTER = 0.05
+    ERROR_RATE = 0.0
+    ERROR_STATUS = 503
+    RETRY_AFTER = None
+
+class MockGroqHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+
+        if not self.path.endswith('/chat/completions'):
+            self.send_json(404, {'error': {'message': f'Unknown path {self.path}'}})
+            return
+
+        server.record_request()
+        time.sleep(max(0.0, random.gauss(server.latency, server.jitter)))
+
+        if random.random() < server.error_rate:
+            headers = {}
+            if server.retry_after is not None:
+                headers['Retry-After'] = str(server.retry_after)
+            self.send_json(server.error_status, {'error': {'message': 'Injected error'}}, headers)
+            return
+
+        messages = request.get('messages', [])
+        content = server.pick_response(messages)
+        prompt_chars = sum(len(m.get('content', '')) for m in messages)
+        self.send_json(200, {
+            'id': f'chatcmpl-mock-{server.request_count}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': request.get('model', 'mock'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop'
+            }],
+            'usage': {
+                'prompt_tokens': prompt_chars // 4,
+                'completion_tokens': len(content) // 4,
+                'total_tokens': (prompt_chars + len(content)) // 4
+            }
+        })
+
+class MockGroqServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, recorded=None, latency=MockServerConfig.LATENCY,
+                 jitter=MockServerConfig.JITTER, error_rate=MockServerConfig.ERROR_RATE,
+                 error_status=MockServerConfig.ERROR_STATUS, retry_after=MockServerConfig.RETRY_AFTER):
+        super().__init__(address, MockGroqHandler)
+        recorded = recorded or load_json_fixture('recorded_responses.json')
+        self.routes = recorded['routes']
+        self.default_response = recorded['default']
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.request_count = 0
+        self.route_counters = {}
+        self.lock = threading.Lock()
+
+    def record_request(self):
+        with self.lock:
+            self.request_count += 1
+
+    def pick_response(self, messages):
+        """Match the system prompt against recorded routes and cycle through their responses"""
+        system_prompt = " ".join(m.get('content', '') for m in messages if m.get('role') == 'system').lower()
+        for route in self.routes:
+            if route['match'] in system_prompt:
+                with self.lock:
+                    index = self.route_counters.get(route['match'], 0)
+                    self.route_counters[route['match']] = index + 1
+                return route['responses'][index % len(route['responses'])]
+        return self.default_response
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+def start_mock_server(host="127.0.0.1", port=0, **options):
+    """Start the mock server on a background thread and return it"""
+    server = MockGroqServer((host, port), **options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock Groq chat completions server")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=MockServerConfig.LATENCY)
+    parser.add_argument('--jitter', type=float, default=MockServerConfig.JITTER)
+    parser.add_argument('--error-rate', type=float, default=MockServerConfig.ERROR_RATE)
+    parser.add_argument('--error-status', type=int, default=MockServerConfig.ERROR_STATUS)
+    parser.add_argument('--retry-after', type=float, default=MockServerConfig.RETRY_AFTER)
+    args = parser.parse_args()
+
+    server = MockGroqServer(
+        (args.host, args.port),
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        retry_after=args.retry_after
+    )
+    print(f"Mock Groq server listening on {server.base_url}")
+    server.serve_forever()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+End-to-end interview benchmark against the local mock Groq server.
+Drives full interviews headlessly and reports turn latency, LLM calls per interview,
+throughput at N concurrent sessions and memory.
+
+Usage:
+    python -m benchmarks.run_benchmark --sessions 4 --latency 0.2
+    python -m benchmarks.run_benchmark --output bench.json
+    python -m benchmarks.run_benchmark --baseline bench.json --tolerance 0.2
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fixtures import load_json_fixture, build_resume_pdf, build_answer_wav
+from benchmarks.mock_groq_server import start_mock_server, MockServerConfig
+
+# Keep benchmark spans out of the application's metrics file
+os.environ.setdefault('INTERVIEW_METRICS_FILE', os.path.join(tempfile.gettempdir(), 'interview_benchmark_metrics.jsonl'))
+
+from tracing import TracingConfig, percentile, get_stage_stats, load_spans
+from resume_parser import extract_resume
+from question_generator import generate_initial_questions
+from interview_session import new_interview_state, record_answer, is_interview_finished, finish_interview
+
+# Metrics compared against a baseline; higher is worse for all of them
+REGRESSION_METRICS = ['turn_p50_ms', 'turn_p95_ms', 'llm_calls_per_interview', 'peak_memory_mb']
+
+def decode_only(recognizer, audio):
+    """Offline stand-in for speech recognition so --audio times file loading and decoding, not the network"""
+    return audio.get_raw_data()
+
+def run_interview(resume_pdf, answers, audio_path=None):
+    """
+    Run one interview from resume upload to final assessment.
+    Returns:
+        dict: Per-interview timings and counts
+    """
+    state = new_interview_state()
+    state['resume_text'] = extract_resume(BytesIO(resume_pdf))
+    state['questions'] = generate_initial_questions(state['resume_text'])[:15]
+
+    turn_latencies = []
+    while not is_interview_finished(state):
+        start = time.perf_counter()
+        if audio_path:
+            # Time the transcription stage; answers come from the fixture so runs stay deterministic
+            from speech_handler import recognize_speech_from_file
+            recognize_speech_from_file(audio_path, transcriber=decode_only)
+        answer = answers[state['current_question'] % len(answers)]
+        record_answer(state, answer)
+        turn_latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    finish_interview(state)
+    return {
+        'turn_latencies_ms': turn_latencies,
+        'final_assessment_ms': (time.perf_counter() - start) * 1000,
+        'questions_asked': len(state['answers'])
+    }
+
+def run_benchmark(sessions=1, latency=MockServerConfig.LATENCY, jitter=MockServerConfig.JITTER,
+                  error_rate=0.0, retry_after=None, audio=False):
+    """Start the mock server, run the given number of concurrent interviews and summarize them"""
+    server = start_mock_server(latency=latency, jitter=jitter, error_rate=error_rate, retry_after=retry_after)
+    os.environ['GROQ_BASE_URL'] = server.base_url
+    os.environ.setdefault('GROQ_API_KEY', 'benchmark')
+
+    resume_pdf = build_resume_pdf()
+    answers = load_json_fixture('answers.json')
+    audio_path = None
+    if audio:
+        audio_path = build_answer_wav(os.path.join(tempfile.gettempdir(), 'interview_benchmark_answer.wav'))
+
+    # Each run writes its spans to a fresh file; the in-memory span buffer is bounded
+    # and would drop calls from larger runs
+    metrics_fd, metrics_file = tempfile.mkstemp(prefix='interview_benchmark_', suffix='.jsonl')
+    os.close(metrics_fd)
+    previous_metrics_file, TracingConfig.METRICS_FILE = TracingConfig.METRICS_FILE, metrics_file
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=sessions) as executor:
+            results = list(executor.map(lambda _: run_interview(resume_pdf, answers, audio_path), range(sessions)))
+        wall_time = time.perf_counter() - start
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        server.shutdown()
+        TracingConfig.METRICS_FILE = previous_metrics_file
+
+    turn_latencies = sorted(t for r in results for t in r['turn_latencies_ms'])
+    final_latencies = sorted(r['final_assessment_ms'] for r in results)
+    stage_stats = get_stage_stats(load_spans(metrics_file))
+    os.remove(metrics_file)
+    llm_calls = stage_stats.get('llm_call', {}).get('count', 0)
+
+    return {
+        'sessions': sessions,
+        'mock_latency_s': latency,
+        'error_rate': error_rate,
+        'wall_time_s': round(wall_time, 3),
+        'interviews_per_minute': round(sessions / wall_time * 60, 2),
+        'questions_per_interview': sum(r['questions_asked'] for r in results) / sessions,
+        'turn_p50_ms': round(percentile(turn_latencies, 0.50), 1),
+        'turn_p95_ms': round(percentile(turn_latencies, 0.95), 1),
+        'final_assessment_p50_ms': round(percentile(final_latencies, 0.50), 1),
+        'llm_calls_per_interview': round(llm_calls / sessions, 2),
+        'http_requests_per_interview': round(server.request_count / sessions, 2),
+        'peak_memory_mb': round(peak_memory / 1024 / 1024, 2),
+        'stages': {
+            stage: {'count': entry['count'], 'p50_ms': entry['p50_ms'], 'p95_ms': entry['p95_ms']}
+            for stage, entry in stage_stats.items()
+        }
+    }
+
+def find_regressions(report, baseline, tolerance):
+    """Return the metrics that got worse than the baseline by more than tolerance"""
+    regressions = []
+    for metric in REGRESSION_METRICS:
+        previous = baseline.get(metric)
+        if previous and report[metric] > previous * (1 + tolerance):
+            regressions.append(f"{metric}: {previous} -> {report[metric]}")
+    return regressions
+
+def print_report(report):
+    print(f"Sessions: {report['sessions']} (mock latency {report['mock_latency_s']}s, error rate {report['error_rate']})")
+    print(f"Wall time: {report['wall_time_s']}s, throughput: {report['interviews_per_minute']} interviews/min")
+    print(f"Questions per interview: {report['questions_per_interview']}")
+    print(f"Turn latency: p50 {report['turn_p50_ms']}ms, p95 {report['turn_p95_ms']}ms")
+    print(f"Final assessment p50: {report['final_assessment_p50_ms']}ms")
+    print(f"LLM calls per interview: {report['llm_calls_per_interview']} "
+          f"({report['http_requests_per_interview']} HTTP requests incl. retries)")
+    print(f"Peak traced memory: {report['peak_memory_mb']}MB")
+    print("Stages:")
+    for stage, entry in sorted(report['stages'].items(), key=lambda item: -item[1]['p95_ms']):
+        print(f"  {stage:<30} n={entry['count']:<5} p50={entry['p50_ms']:.1f}ms p95={entry['p95_ms']:.1f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end interview benchmark")
+    parser.add_argument('--sessions', type=int, default=1, help="Concurrent interview sessions")
+    parser.add_argument('--latency', type=float, default=MockServerConfig.LATENCY)
+    parser.add_argument('--jitter', type=float, default=MockServerConfig.JITTER)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--retry-after', type=float, default=None)
+    parser.add_argument('--audio', action='store_true', help="Also time loading and decoding a WAV fixture (recognition is stubbed offline)")
+    parser.add_argument('--output', help="Write the report as JSON")
+    parser.add_argument('--baseline', help="Fail if metrics regress against this JSON report")
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args()
+
+    report = run_benchmark(
+        sessions=args.sessions,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        retry_after=args.retry_after,
+        audio=args.audio
+    )
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=4)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = find_regressions(report, json.load(f), args.tolerance)
+        if regressions:
+            print("Performance regressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
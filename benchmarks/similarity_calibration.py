@@ -0,0 +1,64 @@
+"""
+Duplicate-question threshold calibration against a labelled list of question pairs.
+Scores every pair, reports the misclassified ones at the configured threshold and
+suggests the threshold that best separates duplicates from follow-ups.
+
+Usage:
+    python -m benchmarks.similarity_calibration
+    python -m benchmarks.similarity_calibration --pairs my_pairs.json
+"""
+import sys
+import json
+import argparse
+
+from benchmarks.fixtures import load_json_fixture
+from question_similarity import SimilarityConfig, get_terms, question_similarity
+
+def score_pairs(pairs):
+    """Return (score, pair) for each labelled pair"""
+    return [(question_similarity(get_terms(pair['a']), get_terms(pair['b'])), pair) for pair in pairs]
+
+def misclassified(scored, threshold):
+    return [(score, pair) for score, pair in scored if (score >= threshold) != pair['duplicate']]
+
+def best_threshold(scored):
+    """
+    Threshold with the fewest misclassified pairs; ties go to the widest gap between neighbouring
+    scores, and the threshold sits in the middle of that gap.
+    """
+    scores = sorted({0.0, 1.01} | {round(score, 4) for score, _ in scored})
+    candidates = [((low + high) / 2, high - low) for low, high in zip(scores, scores[1:])]
+    threshold, _ = min(candidates, key=lambda c: (len(misclassified(scored, c[0])), -c[1]))
+    return round(threshold, 2)
+
+def main():
+    parser = argparse.ArgumentParser(description="Duplicate-question threshold calibration")
+    parser.add_argument('--pairs', help="JSON list of {a, b, duplicate} pairs (default: the fixture)")
+    parser.add_argument('--threshold', type=float, default=SimilarityConfig.DUPLICATE_THRESHOLD)
+    args = parser.parse_args()
+
+    if args.pairs:
+        with open(args.pairs) as f:
+            pairs = json.load(f)
+    else:
+        pairs = load_json_fixture('question_pairs.json')
+
+    scored = score_pairs(pairs)
+    for score, pair in sorted(scored, key=lambda item: -item[0]):
+        label = "dup" if pair['duplicate'] else "new"
+        print(f"{score:.2f} {label}  {pair['a']}  |  {pair['b']}")
+
+    duplicates = [score for score, pair in scored if pair['duplicate']]
+    follow_ups = [score for score, pair in scored if not pair['duplicate']]
+    print(f"\nDuplicates: min {min(duplicates, default=0):.2f}, follow-ups: max {max(follow_ups, default=0):.2f}")
+    print(f"Suggested threshold: {best_threshold(scored)}")
+
+    errors = misclassified(scored, args.threshold)
+    print(f"Misclassified at {args.threshold}: {len(errors)}/{len(scored)}")
+    for score, pair in errors:
+        print(f"  {score:.2f} {pair['a']}  |  {pair['b']} (duplicate={pair['duplicate']})")
+    if errors:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Skill-area classification check against labelled question/answer pairs.
+Early stopping counts distinct skill areas for coverage, so an answer that lands in
+the wrong area can end an interview too soon.
+
+Usage:
+    python -m benchmarks.skill_area_check
+"""
+import sys
+
+from benchmarks.fixtures import load_json_fixture
+from early_stopping import get_skill_area
+
+def main():
+    cases = load_json_fixture('skill_areas.json')
+    mismatches = []
+    for case in cases:
+        area = get_skill_area(case['question'], case['answer'])
+        status = "ok  " if area == case['area'] else "FAIL"
+        print(f"{status} {area:<20} {case['question']}")
+        if area != case['area']:
+            mismatches.append((case, area))
+
+    print(f"\nMisclassified: {len(mismatches)}/{len(cases)}")
+    for case, area in mismatches:
+        print(f"  expected {case['area']}, got {area}: {case['question']}")
+    if mismatches:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Cold-start benchmark: import time of the app modules in a fresh interpreter,
+and a check that the audio, NLTK and PDF stacks stay unloaded until first use.
+
+Usage:
+    python -m benchmarks.startup_benchmark
+    python -m benchmarks.startup_benchmark --modules main interview_session --runs 10
+"""
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+# Heavy dependencies that should only load when their feature is used
+LAZY_MODULES = ['pyttsx3', 'speech_recognition', 'nltk', 'PyPDF2']
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {lazy!r} if m in sys.modules]}}))
+"""
+
+def measure_import(module, runs=5):
+    """
+    Import a module in fresh interpreters and report the median import time.
+    Returns:
+        dict: median/min seconds and the lazy modules found loaded after import
+    """
+    timings = []
+    loaded = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-c', PROBE.format(module=module, lazy=LAZY_MODULES)],
+            capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            return {'module': module, 'error': result.stderr.strip().splitlines()[-1]}
+        probe = json.loads(result.stdout.strip().splitlines()[-1])
+        timings.append(probe['seconds'])
+        loaded = probe['loaded']
+
+    return {
+        'module': module,
+        'median_ms': round(statistics.median(timings) * 1000, 1),
+        'min_ms': round(min(timings) * 1000, 1),
+        'eagerly_loaded': loaded
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start import benchmark")
+    parser.add_argument('--modules', nargs='+', default=['main', 'interview_session', 'speech_handler', 'resume_parser'])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.modules:
+        result = measure_import(module, args.runs)
+        if 'error' in result:
+            print(f"{module:<20} failed: {result['error']}")
+            failed = True
+            continue
+        print(f"{module:<20} median {result['median_ms']}ms, min {result['min_ms']}ms")
+        if result['eagerly_loaded']:
+            print(f"{'':<20} loaded at import: {', '.join(result['eagerly_loaded'])}")
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
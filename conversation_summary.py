@@ -0,0 +1,145 @@
+import threading
+
+from model import infer_with_retry
+from tracing import traced
+
+class SummaryConfig:
+    """Rolling conversation summary settings"""
+    RECENT_TURNS = 3
+    HISTORY_TOKEN_BUDGET = 1200
+    SUMMARY_TOKEN_BUDGET = 300
+    PROMPT_TOKEN_BUDGET = 3000
+    CHARS_PER_TOKEN = 4
+
+# Guards summary state shared with the background update thread
+_summary_lock = threading.Lock()
+
+def new_summary_state():
+    """Return an empty, JSON-serializable summary state"""
+    return {
+        'summary': "",
+        'summarized_turns': 0,
+        'pending': False
+    }
+
+def estimate_tokens(text):
+    """Cheap token estimate, good enough for enforcing prompt budgets"""
+    return len(text) // SummaryConfig.CHARS_PER_TOKEN + 1
+
+def truncate_to_tokens(text, token_budget):
+    """Cut text so that it fits within the given token budget"""
+    max_chars = token_budget * SummaryConfig.CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    return text[:max(0, max_chars - 3)] + "..."
+
+def format_qa_pairs(pairs):
+    return "\n".join(f"Q: {q}\nA: {a}" for q, a in pairs)
+
+def build_interview_history(interview_context, token_budget=SummaryConfig.HISTORY_TOKEN_BUDGET):
+    """
+    Build the interview history for a prompt: the rolling summary of older turns
+    followed by the turns not yet summarized, verbatim. When the history would exceed
+    token_budget, the oldest verbatim turns are dropped first, then the summary is
+    shortened, and only as a last resort the newest answer is cut (keeping its start).
+    """
+    pairs = list(zip(interview_context.get('questions', []), interview_context.get('answers', [])))
+    summary_state = interview_context.get('summary') or new_summary_state()
+
+    with _summary_lock:
+        summary = summary_state['summary']
+        summarized_turns = min(summary_state['summarized_turns'], len(pairs))
+
+    summary_section = ""
+    if summary:
+        summary_section = truncate_to_tokens(
+            f"Summary of earlier discussion:\n{summary}\n",
+            SummaryConfig.SUMMARY_TOKEN_BUDGET
+        )
+
+    # Turns may lag behind the summary while a background update is running
+    verbatim = pairs[summarized_turns:]
+    if not verbatim:
+        return truncate_to_tokens(summary_section, token_budget)
+
+    # The newest turn always goes in; if it alone overflows, trim the end of its answer
+    question, answer = verbatim[-1]
+    newest_cost = estimate_tokens(format_qa_pairs([(question, answer)]))
+    if newest_cost > token_budget:
+        answer_budget = max(1, estimate_tokens(answer) - (newest_cost - token_budget))
+        answer = truncate_to_tokens(answer, answer_budget)
+        newest_cost = estimate_tokens(format_qa_pairs([(question, answer)]))
+    kept = [(question, answer)]
+    remaining = token_budget - newest_cost
+
+    # The summary gets what is left after the newest turn
+    if summary_section:
+        if remaining > SummaryConfig.CHARS_PER_TOKEN:
+            summary_section = truncate_to_tokens(summary_section, remaining)
+            remaining -= estimate_tokens(summary_section)
+        else:
+            summary_section = ""
+
+    # Older verbatim turns fill the rest, newest first
+    for pair in reversed(verbatim[:-1]):
+        cost = estimate_tokens(format_qa_pairs([pair]))
+        if cost > remaining:
+            break
+        kept.insert(0, pair)
+        remaining -= cost
+
+    return summary_section + format_qa_pairs(kept)
+
+@traced('update_summary')
+def update_summary(summary_state, questions, answers, recent_turns=SummaryConfig.RECENT_TURNS):
+    """
+    Fold the turns that fell out of the recent window into the rolling summary.
+    Only the new turns and the previous summary are sent, so each update costs the same.
+    """
+    pairs = list(zip(questions, answers))
+    cutoff = len(pairs) - recent_turns
+
+    with _summary_lock:
+        start = summary_state['summarized_turns']
+        if cutoff <= start or summary_state['pending']:
+            return
+        summary_state['pending'] = True
+        previous_summary = summary_state['summary']
+
+    system_prompt = f"""
+    You maintain a running summary of a job interview. Merge the new exchanges into the
+    existing summary. Keep the candidate's skills, projects, claims and weak points.
+    Keep the summary under {SummaryConfig.SUMMARY_TOKEN_BUDGET * 3 // 4} words.
+    """
+
+    user_prompt = f"""
+    Existing Summary:
+    {previous_summary or "None yet."}
+
+    New Exchanges:
+    {format_qa_pairs(pairs[start:cutoff])}
+    """
+
+    try:
+        response = infer_with_retry([
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ])
+        with _summary_lock:
+            summary_state['summary'] = truncate_to_tokens(response, SummaryConfig.SUMMARY_TOKEN_BUDGET)
+            summary_state['summarized_turns'] = cutoff
+    except Exception as e:
+        print(f"Error updating conversation summary: {e}")
+    finally:
+        with _summary_lock:
+            summary_state['pending'] = False
+
+def schedule_summary_update(summary_state, questions, answers):
+    """Update the rolling summary on a background thread, off the answer-submission path"""
+    thread = threading.Thread(
+        target=update_summary,
+        args=(summary_state, list(questions), list(answers)),
+        daemon=True
+    )
+    thread.start()
+    return thread
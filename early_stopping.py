@@ -0,0 +1,76 @@
+import math
+
+from question_generator import extract_key_topic, get_common_topics
+
+class EarlyStoppingConfig:
+    """Thresholds for ending an interview once the assessment is stable"""
+    ENABLED = True
+    MIN_ANSWERS = 5
+    MIN_SKILL_AREAS = 3
+    MAX_SCORE_MARGIN = 8.0  # Half-width of the 95% confidence interval on the mean score
+    END_INTERVIEW = True  # False only stops generating new questions; queued ones are still asked
+    ERROR_WINDOW = 2  # Never stable while any of the last N scores is an error fallback
+
+# Answers that fit no listed topic don't show breadth, so they don't count toward coverage
+UNCOVERED_AREA = "general"
+
+# Common topics that name an activity rather than a skill; nearly every answer touches them
+NON_SKILL_TOPICS = {'development', 'design', 'implementation'}
+SKILL_TOPICS = [topic for topic in get_common_topics() if topic not in NON_SKILL_TOPICS]
+
+def get_skill_area(question, answer=""):
+    """
+    Map a Q&A pair to a skill area using the common topic list.
+    The question decides; the answer is only consulted when the question names no skill,
+    so a passing word in an answer doesn't open a new area.
+    """
+    for text in (question, answer):
+        topic = extract_key_topic(text, SKILL_TOPICS)
+        if topic != "this technical approach":
+            return topic
+    return UNCOVERED_AREA
+
+def assess_interview(state):
+    """
+    Summarize the evidence gathered so far.
+    Scores from failed evaluations are fallbacks, not evidence, and are left out.
+    Returns:
+        dict: answer count, mean score, confidence margin, per-skill-area stats and whether
+              coverage and confidence pass the configured thresholds
+    """
+    values = []
+    skill_areas = {}
+    for question, answer, score in zip(state['questions'], state['answers'], state['scores']):
+        if score.get("error"):
+            continue
+        value = score.get("relevance_score", 0)
+        values.append(value)
+        area = skill_areas.setdefault(get_skill_area(question, answer), {'answers': 0, 'total': 0})
+        area['answers'] += 1
+        area['total'] += value
+    for area in skill_areas.values():
+        area['mean'] = round(area.pop('total') / area['answers'], 1)
+
+    n = len(values)
+    mean = sum(values) / n if n else 0.0
+    if n > 1:
+        std = math.sqrt(sum((v - mean) ** 2 for v in values) / (n - 1))
+        margin = 1.96 * std / math.sqrt(n)
+    else:
+        margin = float('inf')
+
+    covered = len(set(skill_areas) - {UNCOVERED_AREA}) >= EarlyStoppingConfig.MIN_SKILL_AREAS
+    confident = n >= EarlyStoppingConfig.MIN_ANSWERS and margin <= EarlyStoppingConfig.MAX_SCORE_MARGIN
+    # An evaluation outage would otherwise look like a run of identical scores
+    recent_errors = any(s.get("error") for s in state['scores'][-EarlyStoppingConfig.ERROR_WINDOW:])
+
+    return {
+        'answers': n,
+        'errors': len(state['scores']) - n,
+        'mean_score': round(mean, 1),
+        'score_margin': round(margin, 2) if n > 1 else None,
+        'skill_areas': skill_areas,
+        'coverage_met': covered,
+        'confidence_met': confident,
+        'stable': EarlyStoppingConfig.ENABLED and covered and confident and not recent_errors
+    }
@@ -0,0 +1,96 @@
+import time
+
+from question_generator import generate_unique_adaptive_questions
+from conversation_summary import new_summary_state, schedule_summary_update
+from answer_evaluator import calculate_relevance_score, evaluate_overall_interview
+from early_stopping import EarlyStoppingConfig, assess_interview
+from session_checkpoint import checkpoint_turn, checkpoint_complete
+
+MAX_QUESTIONS = 15
+
+# Interview turn logic, shared by the Streamlit app and headless runs such as the benchmarks
+
+def new_interview_state():
+    """Return a fresh interview state"""
+    return {
+        'current_question': 0,
+        'questions': [],
+        'answers': [],
+        'resume_text': None,
+        'interview_complete': False,
+        'feedback': {},
+        'start_time': None,
+        'question_spoken': False,
+        'context': {},
+        'scores': [],  # Relevance score for each answer
+        'turn_latencies': [],  # Seconds spent processing each answer
+        'stopped_early': False,  # Set once the assessment is stable before the question limit
+        'session_id': None  # Snapshot id; headless runs without one are not checkpointed
+    }
+
+def record_answer(state, answer):
+    """
+    Score an answer, queue follow-up questions and move to the next question.
+    """
+    start = time.perf_counter()
+    questions_before = len(state['questions'])
+    state['answers'].append(answer)
+    current_q = state['questions'][state['current_question']]
+
+    # Calculate relevance score for this answer
+    score = calculate_relevance_score(current_q, answer, state['resume_text'])
+    state['scores'].append(score)
+
+    current_questions = len(state['questions'])
+    summary_state = state['context'].setdefault('summary', new_summary_state())
+
+    # Stop asking for more questions once coverage and score confidence are good enough
+    assessment = assess_interview(state)
+    state['context']['assessment'] = assessment
+    if assessment['stable']:
+        print(f"Assessment stable after {assessment['answers']} answers "
+              f"(mean {assessment['mean_score']} ± {assessment['score_margin']}, "
+              f"{len(assessment['skill_areas'])} skill areas); skipping question generation")
+        if EarlyStoppingConfig.END_INTERVIEW:
+            state['stopped_early'] = True
+
+    # Only generate new questions if we haven't reached the limit yet
+    elif current_questions < MAX_QUESTIONS:
+        # Near-duplicates of earlier questions are filtered out before they enter the state
+        new_questions = generate_unique_adaptive_questions(
+            answer,
+            state['resume_text'],
+            {
+                'questions': state['questions'],
+                'answers': state['answers'],
+                'summary': summary_state
+            }
+        )
+        # Add new questions up to the question limit
+        remaining_slots = MAX_QUESTIONS - current_questions
+        state['questions'].extend(new_questions[:remaining_slots])
+
+    # Compress turns outside the recent window in the background for the next prompt
+    if not assessment['stable']:
+        schedule_summary_update(summary_state, state['questions'], state['answers'])
+
+    state['current_question'] += 1
+    state['question_spoken'] = False
+    state['turn_latencies'].append(round(time.perf_counter() - start, 3))
+    checkpoint_turn(state, questions_before)
+
+def is_interview_finished(state):
+    """The interview ends once all questions are asked, the question limit is reached or it stopped early"""
+    return (state.get('stopped_early', False) or
+            state['current_question'] >= MAX_QUESTIONS or
+            state['current_question'] >= len(state['questions']))
+
+def finish_interview(state):
+    """Generate the overall assessment and mark the interview complete"""
+    state['feedback'] = evaluate_overall_interview(
+        state['questions'][:len(state['answers'])],
+        state['answers'],
+        state['resume_text']
+    )
+    state['interview_complete'] = True
+    checkpoint_complete(state)
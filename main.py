@@ -1,45 +1,45 @@
 import streamlit as st
 from resume_parser import extract_resume
-from question_generator import generate_initial_questions, generate_adaptive_questions
+from question_generator import generate_initial_questions
+from interview_session import new_interview_state, record_answer, is_interview_finished, finish_interview
 from speech_handler import recognize_speech, speak_text
-from answer_evaluator import calculate_relevance_score, evaluate_overall_interview
 from datetime import datetime
 import json
 import os
-from visualization import display_score_visualization
+from visualization import display_score_visualization, display_latency_panel
+from tracing import get_stage_stats
+from session_checkpoint import checkpoint_start, checkpoint_abandon, restore_session, find_resumable_session, is_valid_session_id, new_session_id
 
 
 # Initialize session state
 def initialize_session_state():
     if 'interview_state' not in st.session_state:
-        st.session_state.interview_state = {
-            'current_question': 0,
-            'questions': [],
-            'answers': [],
-            'resume_text': None,
-            'interview_complete': False,
-            'feedback': {},
-            'start_time': None,
-            'question_spoken': False,
-            'context': {},
-            'scores': []  # Add scores list to track relevance scores
-        }
+        st.session_state.interview_state = new_interview_state()
 
 # Save interview results
 def save_interview_results():
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    # One file per interview, rewritten as it progresses, so analytics sees each interview once.
+    # The session id keeps interviews that start in the same second apart.
+    state = st.session_state.interview_state
+    state['session_id'] = state['session_id'] or new_session_id()
+    start_time = state['start_time'] or datetime.now()
+    timestamp = start_time.strftime("%Y%m%d_%H%M%S")
     results = {
+        'interview_id': state['session_id'],
         'timestamp': timestamp,
         'resume_text': st.session_state.interview_state['resume_text'],
         'questions': st.session_state.interview_state['questions'],
         'answers': st.session_state.interview_state['answers'],
         'feedback': st.session_state.interview_state['feedback'],
         'context': st.session_state.interview_state['context'],
-        'scores': st.session_state.interview_state['scores']  # Include scores in saved results
+        'scores': st.session_state.interview_state['scores'],  # Include scores in saved results
+        'turn_latencies': st.session_state.interview_state['turn_latencies'],
+        'interview_complete': st.session_state.interview_state['interview_complete'],
+        'stopped_early': st.session_state.interview_state['stopped_early']
     }
 
     os.makedirs('interview_results', exist_ok=True)
-    filename = f'interview_results/interview_{timestamp}.json'
+    filename = f"interview_results/interview_{timestamp}_{state['session_id']}.json"
     with open(filename, 'w') as f:
         json.dump(results, f, indent=4)
     return filename
@@ -52,74 +52,62 @@ def display_interview_progress():
     st.progress(progress)
     st.caption(f"Question {current + 1} of {min(10, total_questions)} (Max: 10)")
 
+# Pick voice or text answers; text mode never loads the audio stack
+def get_answer_mode():
+    default_mode = os.getenv('INTERVIEW_ANSWER_MODE', 'voice')
+    modes = ["voice", "text"]
+    return st.sidebar.radio(
+        "Answer mode",
+        modes,
+        index=modes.index(default_mode) if default_mode in modes else 0,
+        format_func=lambda mode: "🎙️ Voice" if mode == "voice" else "⌨️ Text"
+    )
+
 # Handle answer submission
-def handle_answer_submission():
-    with st.spinner("Listening for your response..."):
-        answer = recognize_speech()
-        if answer:
-            st.session_state.interview_state['answers'].append(answer)
-            current_q_index = st.session_state.interview_state['current_question']
-            current_q = st.session_state.interview_state['questions'][current_q_index]
-            
-            # Calculate relevance score for this answer
-            with st.spinner("Evaluating your answer..."):
-                score = calculate_relevance_score(
-                    current_q, 
-                    answer, 
-                    st.session_state.interview_state['resume_text']
-                )
-                st.session_state.interview_state['scores'].append(score)
-            
-            current_questions = len(st.session_state.interview_state['questions'])
-            
-            # Only generate new questions if we haven't reached 15 yet
-            if current_questions < 15:
-                new_questions = generate_adaptive_questions(
-                    answer,
-                    st.session_state.interview_state['resume_text'],
-                    {
-                        'questions': st.session_state.interview_state['questions'],
-                        'answers': st.session_state.interview_state['answers']
-                    }
-                )
-                # Add new questions up to the 15-question limit
-                remaining_slots = 15 - current_questions
-                st.session_state.interview_state['questions'].extend(new_questions[:remaining_slots])
+def handle_answer_submission(answer=None):
+    # Voice mode records the answer; text mode passes it in
+    if answer is None:
+        with st.spinner("Listening for your response..."):
+            answer = recognize_speech()
+    if answer:
+        with st.spinner("Evaluating your answer..."):
+            record_answer(st.session_state.interview_state, answer)
 
-            st.session_state.interview_state['current_question'] += 1
-            st.session_state.interview_state['question_spoken'] = False
+        # Mark interview complete only if we've asked all 15 questions or run out of questions
+        if is_interview_finished(st.session_state.interview_state):
+            # Generate overall feedback
+            with st.spinner("Generating final interview assessment..."):
+                finish_interview(st.session_state.interview_state)
 
-            # Mark interview complete only if we've asked all 15 questions or run out of questions
-            if (st.session_state.interview_state['current_question'] >= 15 or 
-                st.session_state.interview_state['current_question'] >= len(st.session_state.interview_state['questions'])):
-                
-                # Generate overall feedback
-                with st.spinner("Generating final interview assessment..."):
-                    overall_evaluation = evaluate_overall_interview(
-                        st.session_state.interview_state['questions'][:len(st.session_state.interview_state['answers'])],
-                        st.session_state.interview_state['answers'],
-                        st.session_state.interview_state['resume_text']
-                    )
-                    st.session_state.interview_state['feedback'] = overall_evaluation
-                
-                st.session_state.interview_state['interview_complete'] = True
+        st.rerun()
+
+# Restore an unfinished interview after a refresh or worker restart
+def try_restore_session(resume_text):
+    # Only look once per uploaded resume; later reruns skip the file scan
+    if st.session_state.get('restore_checked') == resume_text:
+        return False
+    st.session_state.restore_checked = resume_text
 
-            st.rerun()
+    # A missing, malformed or mismatched ?session= falls back to this resume's latest session
+    state = st.session_state.interview_state
+    session_id = st.query_params.get('session')
+    if not (is_valid_session_id(session_id) and restore_session(state, session_id, resume_text)):
+        session_id = find_resumable_session(resume_text)
+        if not (session_id and restore_session(state, session_id, resume_text)):
+            return False
+    st.query_params['session'] = session_id
+
+    # The last answer may have been saved just before the final assessment was written
+    if is_interview_finished(state) and not state['interview_complete']:
+        with st.spinner("Generating final interview assessment..."):
+            finish_interview(state)
+    return True
 
 # Reset interview
 def reset_interview():
-    st.session_state.interview_state = {
-        'current_question': 0,
-        'questions': [],
-        'answers': [],
-        'resume_text': None,
-        'interview_complete': False,
-        'feedback': {},
-        'start_time': None,
-        'question_spoken': False,
-        'context': {},
-        'scores': []  # Reset scores
-    }
+    checkpoint_abandon(st.session_state.interview_state)
+    st.query_params.clear()
+    st.session_state.interview_state = new_interview_state()
 
 # Display answer score and feedback
 def display_score_feedback(score, question_index):
@@ -156,6 +144,14 @@ def main():
         This tool will guide you through technical, project-based, and behavioral questions.
     """)
 
+    answer_mode = get_answer_mode()
+
+    # Optional per-stage latency and token usage panel
+    if st.sidebar.checkbox("Show performance debug panel"):
+        with st.sidebar:
+            st.subheader("⏱️ Stage Latency")
+            display_latency_panel(get_stage_stats())
+
     uploaded_file = st.file_uploader("📄 Upload your Resume (PDF)", type=["pdf"])
     if uploaded_file:
         with st.spinner("Analyzing your resume..."):
@@ -164,6 +160,9 @@ def main():
                 st.session_state.interview_state['resume_text'] = resume_text
                 st.success("✅ Resume processed successfully!")
 
+                if not st.session_state.interview_state['questions'] and try_restore_session(resume_text):
+                    st.info("↩️ Resumed your previous interview where you left off.")
+
                 if not st.session_state.interview_state['questions']:
                     if st.button("🎤 Start Interview"):
                         st.session_state.interview_state['start_time'] = datetime.now()
@@ -172,25 +171,35 @@ def main():
                             # Ensure we don't exceed 15 questions initially
                             st.session_state.interview_state['questions'] = initial_questions[:15]
                             st.session_state.interview_state['current_question'] = 0
+                            # Snapshot the session so a refresh can pick up where it left off
+                            st.query_params['session'] = checkpoint_start(st.session_state.interview_state)
                             st.rerun()
 
                 if st.session_state.interview_state['questions']:
                     display_interview_progress()
 
                     current_q = st.session_state.interview_state['current_question']
-                    if current_q < len(st.session_state.interview_state['questions']):
+                    if (current_q < len(st.session_state.interview_state['questions']) and
+                            not st.session_state.interview_state['interview_complete']):
                         question = st.session_state.interview_state['questions'][current_q]
                         st.info(f"**🤖 Question:** {question}")
 
-                        if not st.session_state.interview_state['question_spoken']:
-                            speak_text(question)
-                            st.session_state.interview_state['question_spoken'] = True
+                        if answer_mode == "voice":
+                            if not st.session_state.interview_state['question_spoken']:
+                                speak_text(question)
+                                st.session_state.interview_state['question_spoken'] = True
 
-                        if st.button("🎙️ Record Answer", key=f"record_{current_q}"):
-                            handle_answer_submission()
+                            if st.button("🎙️ Record Answer", key=f"record_{current_q}"):
+                                handle_answer_submission()
+                        else:
+                            answer_text = st.text_area("⌨️ Your Answer", key=f"answer_{current_q}")
+                            if st.button("📨 Submit Answer", key=f"submit_{current_q}") and answer_text.strip():
+                                handle_answer_submission(answer_text.strip())
 
-                        if st.session_state.interview_state['interview_complete']:
-                           st.success("🎯 Interview Complete!")
+                    if st.session_state.interview_state['interview_complete']:
+                        st.success("🎯 Interview Complete!")
+                        if st.session_state.interview_state['stopped_early']:
+                            st.caption("The interview ended early because the assessment was already stable.")
                     results_file = save_interview_results()
                     st.write(f"Results saved to: `{results_file}`")
 
@@ -1,46 +1,233 @@
 import os
 import time
-from groq import Groq
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from email.utils import parsedate_to_datetime
+from groq import Groq, APIConnectionError, APITimeoutError
 from dotenv import load_dotenv
+from tracing import span
 
 # Load environment variables
 load_dotenv()
 
+class RetryConfig:
+    """Retry, deadline and circuit breaker settings for Groq API calls"""
+    BASE_DELAY = 0.5
+    MAX_DELAY = 8.0
+    DEADLINE = 30.0
+    MAX_RETRY_AFTER = 10.0
+    HEDGE_AFTER = None  # Seconds before a hedged second request is sent; None disables hedging
+    BREAKER_FAILURE_THRESHOLD = 3  # Consecutive failed calls (after their retries), not attempts
+    BREAKER_RESET_TIMEOUT = 30.0
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+class GroqAPIError(Exception):
+    """API failure carrying what the retry policy needs to decide on a retry"""
+    def __init__(self, message, status_code=None, retry_after=None, retryable=True):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.retryable = retryable
+
+class CircuitOpenError(Exception):
+    """Raised without calling the API while the circuit breaker is open"""
+
+class CircuitBreaker:
+    """
+    Stops calling the API after repeated failures so callers can go straight to fallbacks.
+    Failures are counted per call once its retries are exhausted, not per attempt.
+    After reset_timeout one trial call is let through; its outcome closes or re-opens the circuit.
+    """
+    def __init__(self, failure_threshold=RetryConfig.BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout=RetryConfig.BREAKER_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.lock = threading.Lock()
+
+    def allow_request(self):
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.reset_timeout and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def is_open(self):
+        with self.lock:
+            return self.opened_at is not None
+
+    def release_trial(self):
+        """Free the half-open trial slot without counting the call as a success or a failure"""
+        with self.lock:
+            self.trial_in_flight = False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.trial_in_flight = False
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+circuit_breaker = CircuitBreaker()
+
 def get_groq_client():
     """Initialize and return Groq client with API key"""
     api_key = os.getenv('GROQ_API_KEY')
     if not api_key:
         raise ValueError("GROQ_API_KEY not found in environment variables")
-    return Groq(api_key=api_key)
+    # GROQ_BASE_URL points the client at a compatible server, e.g. the benchmark mock.
+    # SDK-level retries are disabled because infer_with_retry owns the retry policy.
+    return Groq(api_key=api_key, base_url=os.getenv('GROQ_BASE_URL') or None, max_retries=0)
+
+def parse_retry_after(headers):
+    """Read a server Retry-After hint (seconds or HTTP date) from response headers"""
+    if not headers:
+        return None
+    value = headers.get('retry-after-ms')
+    if value is not None:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get('retry-after')
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
 
-def infer_with_groq_api(messages, model="mistral-saba-24b", temperature=0.7, max_tokens=1024, top_p=0.9):
+def classify_api_error(error):
+    """Wrap an SDK exception in a GroqAPIError with its status, Retry-After hint and retryability"""
+    status_code = getattr(error, 'status_code', None)
+    response = getattr(error, 'response', None)
+    retry_after = parse_retry_after(getattr(response, 'headers', None))
+
+    if isinstance(error, (APIConnectionError, APITimeoutError)):
+        retryable = True
+    elif status_code is not None:
+        retryable = status_code in RETRYABLE_STATUS_CODES
+    else:
+        # Configuration problems such as a missing API key and unexpected bugs never fix themselves
+        retryable = False
+
+    return GroqAPIError(f"API Error: {str(error)}", status_code, retry_after, retryable)
+
+def infer_with_groq_api(messages, model="mistral-saba-24b", temperature=0.7, max_tokens=1024, top_p=0.9, timeout=None):
     """
     Interact with the Groq API using the specified model and messages.
     """
-    try:
-        client = get_groq_client()
-        completion = client.chat.completions.create(
-            model=model,
-            messages=messages,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            top_p=top_p,
-            stream=False
-        )
-        return completion.choices[0].message.content.strip()
-    except Exception as e:
-        raise Exception(f"API Error: {str(e)}")
-
-def infer_with_retry(messages, max_retries=3):
-    """
-    Retry API calls with exponential backoff.
-    """
-    for attempt in range(max_retries):
+    with span('llm_request', model=model) as trace:
         try:
-            return infer_with_groq_api(messages)
+            client = get_groq_client()
+            request_options = {'timeout': timeout} if timeout is not None else {}
+            completion = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                top_p=top_p,
+                stream=False,
+                **request_options
+            )
+            usage = getattr(completion, 'usage', None)
+            if usage is not None:
+                trace['prompt_tokens'] = getattr(usage, 'prompt_tokens', None)
+                trace['completion_tokens'] = getattr(usage, 'completion_tokens', None)
+            # Malformed responses (no choices, null content) are classified like any other failure
+            return completion.choices[0].message.content.strip()
         except Exception as e:
-            if attempt == max_retries - 1:
-                raise
-            wait_time = 2 ** attempt
-            print(f"Attempt {attempt + 1} failed. Retrying in {wait_time} seconds...")
-            time.sleep(wait_time)
\ No newline at end of file
+            raise classify_api_error(e) from e
+
+def infer_with_hedging(messages, timeout, hedge_after=RetryConfig.HEDGE_AFTER):
+    """
+    Send a request and, if it hasn't answered within hedge_after seconds, a second identical one.
+    The first successful response wins.
+    """
+    if not hedge_after or timeout <= hedge_after:
+        return infer_with_groq_api(messages, timeout=timeout)
+
+    executor = ThreadPoolExecutor(max_workers=2)
+    try:
+        futures = {executor.submit(infer_with_groq_api, messages, timeout=timeout)}
+        done, _ = wait(futures, timeout=hedge_after)
+        if not done:
+            futures.add(executor.submit(infer_with_groq_api, messages, timeout=timeout - hedge_after))
+
+        error = None
+        pending = futures
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        raise error
+    finally:
+        # Don't wait for the losing request
+        executor.shutdown(wait=False)
+
+def infer_with_retry(messages, max_retries=3, deadline=RetryConfig.DEADLINE):
+    """
+    Call the API with retries for transient errors only.
+    Waits use decorrelated jitter, honour Retry-After hints and never run past the deadline.
+    Raises CircuitOpenError immediately while the API is known to be down.
+    """
+    with span('llm_call', retries=0) as trace:
+        if not circuit_breaker.allow_request():
+            trace['circuit_open'] = True
+            raise CircuitOpenError("Groq API circuit is open; skipping call")
+
+        # A call let through while the circuit is open is the half-open trial
+        is_trial = circuit_breaker.is_open()
+        try:
+            start = time.monotonic()
+            delay = RetryConfig.BASE_DELAY
+            for attempt in range(max_retries):
+                trace['retries'] = attempt
+                remaining = deadline - (time.monotonic() - start)
+                try:
+                    result = infer_with_hedging(messages, timeout=remaining)
+                    circuit_breaker.record_success()
+                    return result
+                except GroqAPIError as e:
+                    if not e.retryable:
+                        # Request-side errors say nothing about API health; the trial slot is freed below
+                        raise
+                    # Stop early if the circuit opened meanwhile, or this is a half-open trial call
+                    if attempt == max_retries - 1 or circuit_breaker.is_open():
+                        circuit_breaker.record_failure()
+                        raise
+
+                    delay = min(RetryConfig.MAX_DELAY, random.uniform(RetryConfig.BASE_DELAY, delay * 3))
+                    wait_time = delay
+                    if e.retry_after is not None:
+                        wait_time = max(wait_time, min(e.retry_after, RetryConfig.MAX_RETRY_AFTER))
+
+                    remaining = deadline - (time.monotonic() - start)
+                    if wait_time >= remaining:
+                        circuit_breaker.record_failure()
+                        raise
+                    print(f"Attempt {attempt + 1} failed ({e}). Retrying in {wait_time:.2f} seconds...")
+                    time.sleep(wait_time)
+        except BaseException:
+            # Whatever went wrong, a trial call must not keep the slot, or the circuit never closes
+            if is_trial:
+                circuit_breaker.release_trial()
+            raise
@@ -0,0 +1,47 @@
+import streamlit as st
+from analytics import (
+    ingest_results, load_question_frame, overall_summary,
+    score_distribution_by_topic, question_effectiveness, latency_by_question_index
+)
+from visualization import display_analytics_overview
+
+# Cross-interview analytics over saved results
+
+@st.cache_data(ttl=60)
+def load_frame():
+    ingest_results()
+    return load_question_frame()
+
+def main():
+    st.title("📈 Interview Analytics")
+
+    if st.button("🔄 Refresh"):
+        load_frame.clear()
+
+    try:
+        frame = load_frame()
+    except ImportError as e:
+        st.error(f"Analytics storage needs pyarrow (pip install pyarrow): {e}")
+        return
+
+    if frame.empty:
+        st.info("No completed interviews have been saved yet")
+        return
+
+    display_analytics_overview(overall_summary(frame))
+
+    st.subheader("📊 Scores by Topic")
+    st.dataframe(score_distribution_by_topic(frame))
+
+    st.subheader("❓ Question Effectiveness")
+    st.caption("Questions asked in at least two interviews, ranked by average relevance score")
+    st.dataframe(question_effectiveness(frame))
+
+    st.subheader("⏱️ Turn Latency by Question")
+    latency = latency_by_question_index(frame)
+    if latency.empty:
+        st.info("No turn latency recorded yet")
+    else:
+        st.line_chart(latency)
+
+main()
@@ -1,7 +1,32 @@
+import re
+import hashlib
+
 from model import infer_with_retry
+from question_similarity import QuestionIndex, SimilarityConfig
+from conversation_summary import SummaryConfig, build_interview_history, estimate_tokens, truncate_to_tokens
+from tracing import traced, span
+
+# Resume analysis keyed by resume hash, so each resume costs one LLM call per process
+resume_topics_cache = {}
+
+def hash_resume(resume_text):
+    """Short stable hash that identifies a resume without storing its text"""
+    return hashlib.sha256(resume_text.encode('utf-8')).hexdigest()[:16]
 
 def extract_resume_topics(resume_text):
-    """Extract key topics, skills, and projects from resume"""
+    """Extract key topics, skills, and projects from resume, reusing earlier results for the same resume"""
+    resume_hash = hash_resume(resume_text)
+    with span('extract_resume_topics', cache_hit=resume_hash in resume_topics_cache):
+        if resume_hash not in resume_topics_cache:
+            topics = analyze_resume_topics(resume_text)
+            # Failed analyses are not cached so the next call can retry
+            if not topics:
+                return topics
+            resume_topics_cache[resume_hash] = topics
+        return resume_topics_cache[resume_hash]
+
+def analyze_resume_topics(resume_text):
+    """Ask the model for key topics, skills, and projects from resume"""
     system_prompt = """
     You are an expert resume analyzer. Extract key topics from this resume including:
     1. Technical skills
@@ -30,6 +55,7 @@ def extract_resume_topics(resume_text):
         print(f"Error extracting topics: {e}")
         return {}
 
+@traced('generate_initial_questions')
 def generate_initial_questions(resume_text):
     """Generate initial questions covering different aspects of the resume"""
     resume_topics = extract_resume_topics(resume_text)
@@ -63,20 +89,17 @@ def generate_initial_questions(resume_text):
         print(f"Error generating initial questions: {e}")
         return generate_fallback_initial_questions()
 
-def generate_adaptive_questions(previous_answer, resume_text, interview_context):
-    """Generate follow-up questions based on previous answers and unexplored topics"""
+def request_adaptive_questions(previous_answer, resume_text, interview_context, discussed_topics, avoid_questions=None):
+    """
+    Ask the model for follow-up questions, steering it away from avoid_questions.
+    Returns:
+        tuple: (questions, used_fallback) where used_fallback is True if the model gave no usable questions
+    """
     total_questions = len(interview_context.get('questions', []))
-    if total_questions >= 10:
-        return []
-    
-    questions_remaining = 10 - total_questions
-    num_to_generate = min(2, questions_remaining)
-    
-    # Track discussed topics
-    discussed_topics = analyze_discussed_topics(interview_context)
+    num_to_generate = min(2, 10 - total_questions)
     resume_topics = extract_resume_topics(resume_text)
     
-    system_prompt = f"""
+    system_template = """
     You are an expert AI interviewer conducting a comprehensive interview.
     Topics already discussed: {discussed_topics}
     
@@ -88,42 +111,138 @@ def generate_adaptive_questions(previous_answer, resume_text, interview_context)
     3. Connect different aspects of their experience
     """
     
-    previous_qa = "\n".join([
-        f"Q: {q}\nA: {a}" for q, a in 
-        zip(interview_context.get('questions', []), 
-            interview_context.get('answers', []))
-    ])
-    
-    user_prompt = f"""
+    # The last answer is the final turn of the history, so it isn't repeated separately
+    user_template = """
     Resume Context:
-    {resume_text[:500]}...
+    {resume_excerpt}...
 
     Interview History:
-    {previous_qa}
-
-    Most Recent Answer:
-    {previous_answer}
+    {history}
 
     Generate {num_to_generate} questions that:
-    - Follow up on specific points from their last answer
+    - Follow up on specific points from their last answer (the final turn above)
     - Explore unexplored skills or projects from their resume
     - Connect their previous answers to other relevant experience
     - Ensure comprehensive coverage of their background
-
+    {avoid_section}
     Format: Return exactly {num_to_generate} questions, one per line, starting with 'Q: '
     """
     
+    # On regeneration, list what was already asked or rejected so the model doesn't repeat it
+    avoid_header = """
+    Do not repeat or rephrase any of these questions:
+    """ if avoid_questions else ""
+    
+    # The fixed text is paid for first; the history and the topic lists split what is left
+    resume_excerpt = resume_text[:500]
+    remaining = SummaryConfig.PROMPT_TOKEN_BUDGET - estimate_tokens(
+        system_template.format(discussed_topics="", resume_topics="") +
+        user_template.format(resume_excerpt=resume_excerpt, history="", num_to_generate=num_to_generate,
+                             avoid_section=avoid_header)
+    )
+    
+    # Older turns are folded into a rolling summary so the history stays bounded
+    previous_qa = build_interview_history(
+        interview_context, min(SummaryConfig.HISTORY_TOKEN_BUDGET, max(0, remaining) // 2)
+    )
+    remaining -= estimate_tokens(previous_qa)
+    
+    slice_budget = max(0, remaining) // (3 if avoid_questions else 2)
+    system_prompt = system_template.format(
+        discussed_topics=truncate_to_tokens(str(discussed_topics), slice_budget),
+        resume_topics=truncate_to_tokens(str(resume_topics), slice_budget)
+    )
+    avoid_section = ""
+    if avoid_questions:
+        avoid_section = avoid_header + truncate_to_tokens("\n".join(avoid_questions), slice_budget)
+    user_prompt = user_template.format(
+        resume_excerpt=resume_excerpt,
+        history=previous_qa,
+        num_to_generate=num_to_generate,
+        avoid_section=avoid_section
+    )
+    
+    # Token estimates are per part, so enforce the hard limit on the final prompt as well
+    user_budget = SummaryConfig.PROMPT_TOKEN_BUDGET - estimate_tokens(system_prompt)
+    if estimate_tokens(user_prompt) > user_budget:
+        user_prompt = truncate_to_tokens(user_prompt, user_budget)
+    
     try:
         response = infer_with_retry([
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt}
         ])
         questions = [q.strip() for q in response.split('\n') if q.strip().startswith('Q:')]
-        return questions[:num_to_generate] if questions else generate_fallback_questions(previous_answer, discussed_topics)[:num_to_generate]
+        if questions:
+            return questions[:num_to_generate], False
     except Exception as e:
         print(f"Error generating adaptive questions: {e}")
-        return generate_fallback_questions(previous_answer, discussed_topics)[:num_to_generate]
+    return generate_fallback_questions(previous_answer, discussed_topics)[:num_to_generate], True
+
+def generate_unique_adaptive_questions(previous_answer, resume_text, interview_context,
+                                       regeneration_budget=SimilarityConfig.REGENERATION_BUDGET):
+    """
+    Generate follow-up questions based on previous answers and unexplored topics,
+    rejecting near-duplicates of questions already in the session.
+    Rejected questions are regenerated up to regeneration_budget extra times, with the
+    existing and rejected questions listed in the prompt. Fallback questions are deterministic,
+    so they are never regenerated. If nothing unique is found and no asked question is still
+    waiting for an answer, the least similar candidate is kept so the interview doesn't run dry.
+    """
+    existing = list(interview_context.get('questions', []))
+    if len(existing) >= 10:
+        return []
+    return _generate_unique_questions(previous_answer, resume_text, interview_context, existing, regeneration_budget)
+
+# Traced separately from the question-limit check, so skipped turns don't count as 0 ms generations
+@traced('generate_unique_adaptive_questions')
+def _generate_unique_questions(previous_answer, resume_text, interview_context, existing, regeneration_budget):
+    # Discussed topics don't change between attempts, so analyze them once
+    discussed_topics = analyze_discussed_topics(interview_context)
+    index = QuestionIndex(existing)
+    accepted = []
+    rejected = []
+    closest_rejected = None
+    target = None
+
+    for attempt in range(regeneration_budget + 1):
+        avoid_questions = existing + accepted + rejected if attempt else None
+        candidates, used_fallback = request_adaptive_questions(
+            previous_answer, resume_text, interview_context, discussed_topics, avoid_questions
+        )
+        if not candidates:
+            break
+        if target is None:
+            target = len(candidates)
+
+        for question in candidates:
+            if len(accepted) >= target:
+                break
+            score, match = index.most_similar(question)
+            if score >= index.threshold:
+                print(f"Rejected near-duplicate question (similarity {score:.2f}): {question!r} ~ {match!r}")
+                rejected.append(question)
+                if closest_rejected is None or score < closest_rejected[0]:
+                    closest_rejected = (score, question)
+                continue
+            index.add(question)
+            accepted.append(question)
+
+        if len(accepted) >= target:
+            break
+        if used_fallback:
+            print(f"Not regenerating fallback questions ({len(accepted)}/{target} unique)")
+            break
+        if attempt < regeneration_budget:
+            print(f"Regenerating questions ({len(accepted)}/{target} unique, attempt {attempt + 2})")
+
+    unanswered = len(existing) - len(interview_context.get('answers', []))
+    if not accepted and closest_rejected and unanswered <= 0:
+        print(f"Keeping closest rejected question so the interview continues: {closest_rejected[1]!r}")
+        accepted.append(closest_rejected[1])
+    return accepted
 
+@traced('analyze_discussed_topics')
 def analyze_discussed_topics(interview_context):
     """Analyze which topics have been discussed in the interview so far"""
     system_prompt = """
@@ -131,11 +250,7 @@ def analyze_discussed_topics(interview_context):
     Return a list of key topics, skills, and themes that have been covered.
     """
     
-    qa_history = "\n".join([
-        f"Q: {q}\nA: {a}" for q, a in 
-        zip(interview_context.get('questions', []), 
-            interview_context.get('answers', []))
-    ])
+    qa_history = build_interview_history(interview_context)
     
     try:
         response = infer_with_retry([
@@ -183,10 +298,10 @@ def get_common_topics():
         'leadership', 'development', 'architecture', 'design', 'implementation'
     ]
 
-def extract_key_topic(text):
-    """Extract main topic from the answer"""
+def extract_key_topic(text, topics=None):
+    """Extract main topic from the answer, matching whole words so 'ai' doesn't match 'maintain'"""
     text_lower = text.lower()
-    for topic in get_common_topics():
-        if topic in text_lower:
+    for topic in topics or get_common_topics():
+        if re.search(rf'\b{re.escape(topic)}s?\b', text_lower):
             return topic
     return "this technical approach"
\ No newline at end of file
@@ -0,0 +1,143 @@
+import re
+
+class SimilarityConfig:
+    """Near-duplicate detection settings"""
+    DUPLICATE_THRESHOLD = 0.63  # From benchmarks.similarity_calibration on fixtures/question_pairs.json
+    GENERIC_WEIGHT = 0.2
+    ASPECT_MISMATCH = 0.3  # Same subject from a different angle is a follow-up, not a repeat
+    ASPECT_UNKNOWN = 0.75  # Only one of the two questions names its angle
+    REGENERATION_BUDGET = 1
+
+# Function words carry no meaning for duplicate detection
+STOPWORDS = {
+    'a', 'an', 'the', 'and', 'or', 'but', 'of', 'to', 'in', 'on', 'at', 'for', 'with', 'by', 'from',
+    'about', 'as', 'into', 'through', 'while', 'during', 'this', 'that', 'these', 'those', 'it', 'its',
+    'you', 'your', 'yours', 'me', 'my', 'we', 'our', 'they', 'their', 'i', 'is', 'are', 'was', 'were',
+    'be', 'been', 'being', 'do', 'did', 'does', 'have', 'has', 'had', 'can', 'could', 'would', 'should',
+    'will', 'how', 'what', 'which', 'when', 'where', 'why', 'who', 'any', 'some', 'there', 'if', 'so',
+    'over', 'versus', 'vs', 'than', 'away'
+}
+
+# Interview-question boilerplate; shared phrasing counts for little, so questions that
+# differ only in their topic (e.g. "...working with Kafka?" vs "...with Kubernetes?") stay distinct
+GENERIC_WORDS = {
+    'tell', 'describe', 'explain', 'walk', 'elaborate', 'share', 'provide', 'give', 'specific',
+    'example', 'instance', 'time', 'situation', 'experience', 'work', 'working', 'worked', 'use',
+    'used', 'using', 'project', 'technical', 'biggest', 'main', 'key', 'face', 'faced', 'handle',
+    'handled', 'approach', 'role', 'relate', 'other', 'skill', 'more', 'detail', 'most', 'significant',
+    'like', 'think', 'particular', 'mention', 'mentioned', 'background', 'career', 'previous',
+    'current', 'team', 'process', 'made', 'make', 'take', 'run', 'running', 'part', 'ensure',
+    'maintain', 'practice', 'service', 'system', 'application', 'tool', 'had', 'way'
+}
+
+# The angle a question takes on its subject. Only the first of these words in a question
+# (its head) is treated as the aspect; later ones are ordinary subject words.
+ASPECTS = {
+    'choose': ['choose', 'chose', 'chosen', 'choosing', 'pick', 'picked', 'select', 'selected',
+               'decide', 'decided', 'decision', 'prefer', 'preferred', 'opt', 'opted'],
+    'build': ['build', 'built', 'building', 'implement', 'implemented', 'implementing', 'develop',
+              'developed', 'developing', 'create', 'created', 'creating'],
+    'design': ['design', 'designed', 'designing', 'architect', 'architected', 'structure', 'structured'],
+    'scale': ['scale', 'scaled', 'scaling', 'grow', 'grew'],
+    'test': ['test', 'tested', 'testing', 'validate', 'validated', 'verify', 'verified'],
+    'monitor': ['monitor', 'monitored', 'monitoring', 'observe', 'observed', 'alert', 'alerted'],
+    'deploy': ['deploy', 'deployed', 'deploying', 'release', 'released', 'ship', 'shipped', 'roll', 'rolled'],
+    'debug': ['debug', 'debugged', 'debugging', 'troubleshoot', 'troubleshot', 'troubleshooting',
+              'fix', 'fixed', 'diagnose', 'diagnosed'],
+    'optimize': ['optimize', 'optimized', 'optimizing', 'improve', 'improved', 'cut', 'reduce',
+                 'reduced', 'speed', 'tune', 'tuned'],
+    'migrate': ['migrate', 'migrated', 'migrating', 'upgrade', 'upgraded', 'move', 'moved'],
+    'secure': ['secure', 'secured', 'securing', 'protect', 'protected'],
+    'lead': ['lead', 'led', 'leading', 'manage', 'managed', 'managing', 'mentor', 'mentored',
+             'mentoring', 'coach', 'coached'],
+    'collaborate': ['collaborate', 'collaborated', 'communicate', 'communicated', 'disagree',
+                    'disagreed', 'disagreement', 'conflict', 'negotiate', 'negotiated'],
+    'learn': ['learn', 'learned', 'learnt', 'lesson', 'takeaway', 'differently', 'retrospect'],
+    'challenge': ['challenge', 'challenging', 'difficult', 'difficulty', 'hardest', 'obstacle', 'struggle'],
+    'measure': ['measure', 'measured', 'outcome', 'result', 'impact', 'achieve', 'achieved']
+}
+ASPECT_OF = {word: aspect for aspect, words in ASPECTS.items() for word in words}
+
+def normalize_question(text):
+    """Lowercase a question and strip the 'Q:' prefix and punctuation"""
+    text = re.sub(r'^\s*q:\s*', '', text.lower())
+    return " ".join(re.findall(r'[a-z0-9]+', text))
+
+def fold_plural(word):
+    """Fold simple plurals, e.g. challenges -> challenge"""
+    if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+        return word[:-1]
+    return word
+
+def get_terms(text):
+    """
+    Split a question into its aspect and its weighted subject words.
+    Returns:
+        tuple: (aspect or None, {word: weight}) where topic words weigh 1.0 and
+               interview boilerplate GENERIC_WEIGHT; stopwords are dropped
+    """
+    aspect = None
+    subject = {}
+    for word in normalize_question(text).split():
+        if word in STOPWORDS:
+            continue
+        word = fold_plural(word)
+        if aspect is None and word in ASPECT_OF:
+            aspect = ASPECT_OF[word]
+            continue
+        subject[word] = SimilarityConfig.GENERIC_WEIGHT if word in GENERIC_WORDS else 1.0
+    return aspect, subject
+
+def weighted_dice(terms_a, terms_b):
+    """Weighted Dice overlap between two term-weight dicts; tolerant of an added detail or two"""
+    if not terms_a or not terms_b:
+        return 0.0
+    shared = sum(min(terms_a[t], terms_b[t]) for t in terms_a.keys() & terms_b.keys())
+    return 2 * shared / (sum(terms_a.values()) + sum(terms_b.values()))
+
+def question_similarity(terms_a, terms_b):
+    """
+    Similarity of two questions from their get_terms results: the subject overlap,
+    scaled down when the questions ask about that subject from different angles.
+    """
+    aspect_a, subject_a = terms_a
+    aspect_b, subject_b = terms_b
+    if not subject_a and not subject_b:
+        # Pure boilerplate such as "What challenges did you face?"
+        subject = 1.0 if aspect_a and aspect_a == aspect_b else 0.0
+    else:
+        subject = weighted_dice(subject_a, subject_b)
+
+    if aspect_a and aspect_b:
+        return subject if aspect_a == aspect_b else subject * SimilarityConfig.ASPECT_MISMATCH
+    if aspect_a or aspect_b:
+        return subject * SimilarityConfig.ASPECT_UNKNOWN
+    return subject
+
+class QuestionIndex:
+    """
+    Local similarity index over the questions asked in one interview session.
+    Sessions are capped at 15 questions, so an exact comparison is cheap.
+    """
+    def __init__(self, questions=None, threshold=SimilarityConfig.DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+        self.entries = []
+        for question in questions or []:
+            self.add(question)
+
+    def add(self, question):
+        self.entries.append((question, get_terms(question)))
+
+    def most_similar(self, question):
+        """
+        Find the indexed question closest to the given one.
+        Returns:
+            tuple: (similarity, matching question) or (0.0, None) if the index is empty
+        """
+        terms = get_terms(question)
+        best_score, best_match = 0.0, None
+        for existing, existing_terms in self.entries:
+            score = question_similarity(terms, existing_terms)
+            if score > best_score:
+                best_score, best_match = score, existing
+        return best_score, best_match
@@ -1,10 +1,13 @@
-import PyPDF2
+from tracing import traced
 
+@traced('extract_resume')
 def extract_resume(file_content):
     """
     Extracts text from the uploaded file content.
     """
     try:
+        # PyPDF2 is imported on first use to keep it off the startup path
+        import PyPDF2
         reader = PyPDF2.PdfReader(file_content)
         resume_text = ""
         for page in reader.pages:
@@ -0,0 +1,240 @@
+import os
+import re
+import glob
+import json
+import time
+import uuid
+import threading
+from datetime import datetime
+
+from question_generator import hash_resume, resume_topics_cache
+
+class CheckpointConfig:
+    """Session snapshot settings"""
+    SESSIONS_DIR = os.path.join('interview_results', 'sessions')
+    INDEX_FILE = 'index.json'
+    VERSION = 1
+    RETENTION_DAYS = 7  # Finished and abandoned snapshots older than this are deleted
+
+SESSION_ID_PATTERN = re.compile(r'^[0-9a-f]{12}$')
+
+# Snapshots are append-only JSON lines: a 'start' header, one 'turn' line per answer,
+# then 'complete' or 'abandoned'. Each turn only appends what changed, and replaying
+# the lines rebuilds the interview state without any LLM calls.
+# index.json maps each resume hash to its latest unfinished session, so a resume
+# upload finds its session without scanning the directory.
+
+_index_lock = threading.Lock()
+
+def new_session_id():
+    return uuid.uuid4().hex[:12]
+
+def is_valid_session_id(session_id):
+    """Session ids come from URLs, so only the new_session_id format may reach a file path"""
+    return isinstance(session_id, str) and bool(SESSION_ID_PATTERN.match(session_id))
+
+def checkpoint_path(session_id):
+    if not is_valid_session_id(session_id):
+        raise ValueError(f"Invalid session id: {session_id!r}")
+    return os.path.join(CheckpointConfig.SESSIONS_DIR, f'{session_id}.jsonl')
+
+def index_path():
+    return os.path.join(CheckpointConfig.SESSIONS_DIR, CheckpointConfig.INDEX_FILE)
+
+def load_index():
+    """Return the resume hash -> unfinished session id index, building it once for older snapshot dirs"""
+    path = index_path()
+    if not os.path.exists(path):
+        return build_index()
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return build_index()
+
+def save_index(index):
+    try:
+        os.makedirs(CheckpointConfig.SESSIONS_DIR, exist_ok=True)
+        tmp_path = index_path() + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(index, f)
+        os.replace(tmp_path, index_path())
+    except OSError as e:
+        print(f"Error writing session index: {e}")
+
+def update_index(resume_hash, session_id=None, only_if=None):
+    """
+    Point resume_hash at session_id, or drop its entry when session_id is None.
+    only_if skips the change unless the entry currently points at that session.
+    """
+    with _index_lock:
+        index = load_index()
+        if only_if is not None and index.get(resume_hash) != only_if:
+            return
+        if session_id is None:
+            index.pop(resume_hash, None)
+        else:
+            index[resume_hash] = session_id
+        save_index(index)
+
+def build_index():
+    """Scan all snapshots once for the latest unfinished session of each resume"""
+    index = {}
+    paths = sorted(glob.glob(os.path.join(CheckpointConfig.SESSIONS_DIR, '*.jsonl')), key=os.path.getmtime)
+    for path in paths:
+        session_id = os.path.splitext(os.path.basename(path))[0]
+        if not is_valid_session_id(session_id):
+            continue
+        events = read_events(session_id)
+        if (events and events[0].get('type') == 'start' and
+                events[0].get('version') == CheckpointConfig.VERSION and
+                events[-1]['type'] not in ('complete', 'abandoned')):
+            index[events[0]['resume_hash']] = session_id
+    return index
+
+def prune_sessions(max_age_days=CheckpointConfig.RETENTION_DAYS):
+    """Delete finished and abandoned snapshots that have not been touched for max_age_days"""
+    cutoff = time.time() - max_age_days * 86400
+    for path in glob.glob(os.path.join(CheckpointConfig.SESSIONS_DIR, '*.jsonl')):
+        session_id = os.path.splitext(os.path.basename(path))[0]
+        try:
+            if not is_valid_session_id(session_id) or os.path.getmtime(path) >= cutoff:
+                continue
+            events = read_events(session_id)
+            if events and events[-1]['type'] in ('complete', 'abandoned'):
+                os.remove(path)
+        except OSError as e:
+            print(f"Error pruning session snapshot {path}: {e}")
+
+def write_event(session_id, event):
+    """Append one event line to a session snapshot"""
+    try:
+        os.makedirs(CheckpointConfig.SESSIONS_DIR, exist_ok=True)
+        with open(checkpoint_path(session_id), 'a') as f:
+            f.write(json.dumps(event, separators=(',', ':'), default=str) + "\n")
+    except OSError as e:
+        print(f"Error writing session checkpoint: {e}")
+
+def checkpoint_start(state):
+    """Start a snapshot for a new interview; the resume is stored as a hash only"""
+    state['session_id'] = state.get('session_id') or new_session_id()
+    resume_hash = hash_resume(state['resume_text'])
+    prune_sessions()
+    write_event(state['session_id'], {
+        'type': 'start',
+        'version': CheckpointConfig.VERSION,
+        'resume_hash': resume_hash,
+        'start_time': state['start_time'].isoformat() if state['start_time'] else None,
+        'questions': state['questions'],
+        'resume_topics': resume_topics_cache.get(resume_hash)
+    })
+    update_index(resume_hash, state['session_id'])
+    return state['session_id']
+
+def checkpoint_turn(state, questions_before):
+    """Append the latest answer, its score and any questions added in this turn"""
+    if not state.get('session_id'):
+        return
+    summary = dict(state['context'].get('summary') or {})
+    summary.pop('pending', None)
+    write_event(state['session_id'], {
+        'type': 'turn',
+        'answer': state['answers'][-1],
+        'score': state['scores'][-1],
+        'questions_added': state['questions'][questions_before:],
+        'turn_latency': state['turn_latencies'][-1] if state['turn_latencies'] else None,
+        'stopped_early': state.get('stopped_early', False),
+        'summary': summary
+    })
+
+def checkpoint_complete(state):
+    if state.get('session_id'):
+        write_event(state['session_id'], {'type': 'complete', 'feedback': state['feedback']})
+        update_index(hash_resume(state['resume_text']), only_if=state['session_id'])
+
+def checkpoint_abandon(state):
+    """Mark a session so it is not offered for resumption again"""
+    if state.get('session_id') and not state.get('interview_complete'):
+        write_event(state['session_id'], {'type': 'abandoned'})
+        if state.get('resume_text'):
+            update_index(hash_resume(state['resume_text']), only_if=state['session_id'])
+
+def read_events(session_id):
+    """Read snapshot events, ignoring a partially written last line"""
+    if not is_valid_session_id(session_id):
+        return []
+    path = checkpoint_path(session_id)
+    if not os.path.exists(path):
+        return []
+    events = []
+    with open(path) as f:
+        for line in f:
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError:
+                break
+    return events
+
+def restore_session(state, session_id, resume_text):
+    """
+    Rebuild interview progress from a snapshot into state.
+    Returns:
+        bool: True if the snapshot matched the resume and was restored
+    """
+    events = read_events(session_id)
+    if not events or events[0].get('type') != 'start':
+        return False
+    header = events[0]
+    if header.get('version') != CheckpointConfig.VERSION or header.get('resume_hash') != hash_resume(resume_text):
+        return False
+
+    restored = {
+        'session_id': session_id,
+        'questions': list(header['questions']),
+        'answers': [],
+        'scores': [],
+        'turn_latencies': [],
+        'current_question': 0,
+        'stopped_early': False,
+        'interview_complete': False,
+        'feedback': {},
+        'context': {}
+    }
+    for event in events[1:]:
+        if event['type'] == 'turn':
+            restored['answers'].append(event['answer'])
+            restored['scores'].append(event['score'])
+            restored['questions'].extend(event['questions_added'])
+            if event.get('turn_latency') is not None:
+                restored['turn_latencies'].append(event['turn_latency'])
+            restored['stopped_early'] = event.get('stopped_early', False)
+            if event.get('summary'):
+                restored['context']['summary'] = dict(event['summary'], pending=False)
+            restored['current_question'] += 1
+        elif event['type'] == 'complete':
+            restored['feedback'] = event['feedback']
+            restored['interview_complete'] = True
+        elif event['type'] == 'abandoned':
+            return False
+
+    # Rehydrate the resume analysis so the next turn doesn't repeat it
+    if header.get('resume_topics'):
+        resume_topics_cache.setdefault(header['resume_hash'], header['resume_topics'])
+
+    state.update(restored)
+    state['resume_text'] = resume_text
+    state['start_time'] = datetime.fromisoformat(header['start_time']) if header.get('start_time') else None
+    state['question_spoken'] = False
+    return True
+
+def find_resumable_session(resume_text):
+    """Return the most recent unfinished session for this resume, if any"""
+    with _index_lock:
+        session_id = load_index().get(hash_resume(resume_text))
+    if not session_id:
+        return None
+    events = read_events(session_id)
+    # The index can lag behind a snapshot that was finished or deleted
+    if not events or events[-1]['type'] in ('complete', 'abandoned'):
+        return None
+    return session_id
@@ -0,0 +1,119 @@
+import os
+import json
+import math
+import time
+import threading
+from collections import deque, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+
+class TracingConfig:
+    """Tracing settings"""
+    ENABLED = os.getenv('INTERVIEW_TRACING', '1') != '0'
+    METRICS_FILE = os.getenv('INTERVIEW_METRICS_FILE', 'interview_results/metrics.jsonl')
+    RECENT_SPANS = 2000
+
+# Recent spans kept in memory for the debug panel
+recent_spans = deque(maxlen=TracingConfig.RECENT_SPANS)
+_write_lock = threading.Lock()
+_local = threading.local()
+
+def _span_stack():
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return _local.stack
+
+def record_span(record):
+    """Keep a finished span in memory and append it to the metrics file as one JSON line"""
+    recent_spans.append(record)
+    if not TracingConfig.METRICS_FILE:
+        return
+    try:
+        with _write_lock:
+            directory = os.path.dirname(TracingConfig.METRICS_FILE)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(TracingConfig.METRICS_FILE, 'a') as f:
+                f.write(json.dumps(record, default=str) + "\n")
+    except OSError as e:
+        print(f"Error writing metrics: {e}")
+
+@contextmanager
+def span(stage, **attributes):
+    """
+    Time a block of work as a named stage.
+    Yields a dict that the block can add attributes to (token counts, retries, ...).
+    """
+    if not TracingConfig.ENABLED:
+        yield {}
+        return
+
+    stack = _span_stack()
+    record = {
+        'timestamp': datetime.now().isoformat(),
+        'stage': stage,
+        'parent': stack[-1] if stack else None,
+        'status': 'ok'
+    }
+    record.update(attributes)
+    stack.append(stage)
+    start = time.perf_counter()
+    try:
+        yield record
+    except Exception as e:
+        record['status'] = 'error'
+        record['error'] = str(e)[:200]
+        raise
+    finally:
+        record['duration_ms'] = round((time.perf_counter() - start) * 1000, 2)
+        stack.pop()
+        record_span(record)
+
+def traced(stage):
+    """Decorator that records every call of a function as a span"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def get_stage_stats(spans=None):
+    """
+    Summarize spans per stage.
+    Returns:
+        dict: stage -> count, error count, p50/p95 latency and token totals
+    """
+    durations = defaultdict(list)
+    stats = defaultdict(lambda: {'count': 0, 'errors': 0, 'prompt_tokens': 0, 'completion_tokens': 0})
+    for record in list(recent_spans if spans is None else spans):
+        stage = record['stage']
+        durations[stage].append(record.get('duration_ms', 0))
+        entry = stats[stage]
+        entry['count'] += 1
+        entry['errors'] += record.get('status') == 'error'
+        entry['prompt_tokens'] += record.get('prompt_tokens') or 0
+        entry['completion_tokens'] += record.get('completion_tokens') or 0
+
+    for stage, values in durations.items():
+        values.sort()
+        stats[stage]['p50_ms'] = percentile(values, 0.50)
+        stats[stage]['p95_ms'] = percentile(values, 0.95)
+    return dict(stats)
+
+def load_spans(filename=None):
+    """Read spans back from a metrics file"""
+    filename = filename or TracingConfig.METRICS_FILE
+    if not os.path.exists(filename):
+        return []
+    with open(filename) as f:
+        return [json.loads(line) for line in f if line.strip()]
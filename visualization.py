@@ -2,6 +2,7 @@ import streamlit as st
 import base64
 from io import BytesIO
 import pandas as pd
+from functools import lru_cache
 
 def create_score_gauge(score, width=200, height=120):
     """
@@ -16,12 +17,7 @@ def create_score_gauge(score, width=200, height=120):
         str: HTML for the gauge
     """
     # Determine color based on score
-    if score >= 80:
-        color = "#28a745"  # Green
-    elif score >= 60:
-        color = "#ffc107"  # Yellow
-    else:
-        color = "#dc3545"  # Red
+    color = get_score_color(score)
     
     # Calculate rotation angle (0-180 degrees)
     angle = score * 1.8  # Convert 0-100 to 0-180 degrees
@@ -102,6 +98,42 @@ def create_score_gauge(score, width=200, height=120):
     
     return html
 
+def get_score_color(score):
+    """Return the bar/gauge color for a score"""
+    if score >= 80:
+        return "#28a745"  # Green
+    elif score >= 60:
+        return "#ffc107"  # Yellow
+    return "#dc3545"  # Red
+
+def summarize_scores(score_values):
+    """
+    Compute the average and category counts in a single pass over the scores.
+    
+    Args:
+        score_values (tuple): Relevance scores (0-100)
+        
+    Returns:
+        dict: average, excellent, good and needs_improvement counts
+    """
+    total = 0
+    excellent = good = needs_improvement = 0
+    for score in score_values:
+        total += score
+        if score >= 80:
+            excellent += 1
+        elif score >= 60:
+            good += 1
+        else:
+            needs_improvement += 1
+    
+    return {
+        "average": round(total / len(score_values), 1) if score_values else 0,
+        "excellent": excellent,
+        "good": good,
+        "needs_improvement": needs_improvement
+    }
+
 def generate_score_chart(scores):
     """
     Generate a simple bar chart for question scores
@@ -115,35 +147,21 @@ def generate_score_chart(scores):
     if not scores:
         return "<p>No scores available</p>"
     
-    score_values = [s.get("relevance_score", 0) for s in scores]
-    max_score = 100
-    
-    # Create HTML/CSS bar chart
-    html = """
-    <div style="margin-top:20px;">
-        <div style="display:flex; height:200px; align-items:flex-end; margin-bottom:5px;">
-    """
-    
-    # Add bars
+    return render_score_chart(tuple(s.get("relevance_score", 0) for s in scores))
+
+def render_score_chart(score_values, max_score=100):
+    """Build the bar chart HTML for a tuple of score values"""
+    bars = []
+    labels = []
     for i, score in enumerate(score_values):
-        # Set bar color based on score
-        if score >= 80:
-            color = "#28a745"  # Green
-        elif score >= 60:
-            color = "#ffc107"  # Yellow
-        else:
-            color = "#dc3545"  # Red
-            
         # Calculate height percentage
         height_percent = (score / max_score) * 100
-        
-        # Add bar element
-        html += f"""
+        bars.append(f"""
         <div style="
             flex:1; 
             margin:0 2px; 
             height:{height_percent}%; 
-            background-color:{color};
+            background-color:{get_score_color(score)};
             position:relative;
             border-radius:3px 3px 0 0;
         ">
@@ -157,77 +175,29 @@ def generate_score_chart(scores):
                 {score}
             </div>
         </div>
-        """
+        """)
+        labels.append(f"""
+        <div style="flex:1; text-align:center; font-size:12px;">Q{i+1}</div>
+        """)
     
-    # Close bar container
-    html += """
+    return f"""
+    <div style="margin-top:20px;">
+        <div style="display:flex; height:200px; align-items:flex-end; margin-bottom:5px;">
+            {"".join(bars)}
         </div>
         <div style="display:flex; margin-top:5px;">
-    """
-    
-    # Add labels
-    for i in range(len(score_values)):
-        html += f"""
-        <div style="flex:1; text-align:center; font-size:12px;">Q{i+1}</div>
-        """
-    
-    # Close labels container and main div
-    html += """
+            {"".join(labels)}
         </div>
     </div>
     """
-    
-    return html
 
-def display_score_visualization(scores):
-    """
-    Display visualizations of the interview scores.
-    
-    Args:
-        scores (list): List of score dictionaries
-    """
-    if not scores:
-        st.warning("No scores available to visualize")
-        return
-    
-    # Calculate average score
-    avg_score = sum(s.get("relevance_score", 0) for s in scores) / len(scores)
-    avg_score = round(avg_score, 1)  # Round to 1 decimal place
-    
-    # Create two columns for the visualizations
-    col1, col2 = st.columns(2)
+def render_score_distribution(summary):
+    """Build the distribution strip HTML from a score summary"""
+    excellent = summary["excellent"]
+    good = summary["good"]
+    needs_improvement = summary["needs_improvement"]
     
-    with col1:
-        st.markdown("### Average Relevance Score")
-        # Use st.components.v1.html instead of st.markdown for HTML rendering
-        st.components.v1.html(create_score_gauge(avg_score), height=180, scrolling=False)
-    
-    with col2:
-        st.markdown("### Question-by-Question Scores")
-        # Use st.components.v1.html for the chart too
-        st.components.v1.html(generate_score_chart(scores), height=250, scrolling=False)
-    
-    # Add score distribution
-    st.markdown("### Score Distribution")
-    
-    # Count scores in each category
-    excellent = sum(1 for s in scores if s.get("relevance_score", 0) >= 80)
-    good = sum(1 for s in scores if 60 <= s.get("relevance_score", 0) < 80)
-    needs_improvement = sum(1 for s in scores if s.get("relevance_score", 0) < 60)
-    
-    # Alternative: Use Streamlit's native components for the distribution
-    dist_data = {
-        "Category": ["Excellent", "Good", "Needs Work"],
-        "Count": [excellent, good, needs_improvement],
-        "Color": ["#28a745", "#ffc107", "#dc3545"]
-    }
-    df = pd.DataFrame(dist_data)
-    
-    # Display as a horizontal bar chart
-    st.bar_chart(df.set_index("Category")["Count"])
-    
-    # Or create a custom HTML version if you prefer the original styling
-    distribution_html = f"""
+    return f"""
     <div style="display:flex; margin-top:10px;">
         <div style="
             flex:{max(excellent, 1)}; 
@@ -260,9 +230,102 @@ def display_score_visualization(scores):
         </div>
     </div>
     """
+
+@lru_cache(maxsize=64)
+def render_score_dashboard(score_values):
+    """
+    Build the gauge, per-question chart and distribution as one HTML document.
+    Cached by the score values, so reruns without a new score reuse the HTML.
+    
+    Args:
+        score_values (tuple): Relevance scores (0-100)
+        
+    Returns:
+        str: HTML for the combined visualization
+    """
+    summary = summarize_scores(score_values)
+    heading_style = "font-family:sans-serif; font-size:20px; font-weight:600; margin:0 0 10px 0;"
+    
+    return f"""
+    <div style="font-family:sans-serif;">
+        <div style="display:flex; gap:20px;">
+            <div style="flex:1;">
+                <div style="{heading_style}">Average Relevance Score</div>
+                {create_score_gauge(summary["average"])}
+            </div>
+            <div style="flex:1;">
+                <div style="{heading_style}">Question-by-Question Scores</div>
+                {render_score_chart(score_values)}
+            </div>
+        </div>
+        <div style="{heading_style} margin-top:30px;">Score Distribution</div>
+        {render_score_distribution(summary)}
+    </div>
+    """
+
+def display_score_visualization(scores):
+    """
+    Display visualizations of the interview scores.
+    
+    Args:
+        scores (list): List of score dictionaries
+    """
+    if not scores:
+        st.warning("No scores available to visualize")
+        return
+    
+    # Only the score values affect the output, so they form the cache key
+    score_values = tuple(s.get("relevance_score", 0) for s in scores)
     
-    # Use st.components.v1.html for the distribution visualization
-    st.components.v1.html(distribution_html, height=50, scrolling=False)
+    # Render everything in a single component instead of one iframe per chart
+    st.components.v1.html(render_score_dashboard(score_values), height=420, scrolling=False)
+
+def display_latency_panel(stage_stats):
+    """
+    Display per-stage latency and token usage collected by the tracing layer.
+    
+    Args:
+        stage_stats (dict): Output of tracing.get_stage_stats()
+    """
+    if not stage_stats:
+        st.info("No timing data recorded yet")
+        return
+    
+    rows = [
+        {
+            "Stage": stage,
+            "Calls": entry["count"],
+            "Errors": entry["errors"],
+            "p50 (ms)": round(entry["p50_ms"], 1),
+            "p95 (ms)": round(entry["p95_ms"], 1),
+            "Prompt Tokens": entry["prompt_tokens"],
+            "Completion Tokens": entry["completion_tokens"]
+        }
+        for stage, entry in sorted(stage_stats.items(), key=lambda item: -item[1]["p95_ms"])
+    ]
+    st.dataframe(pd.DataFrame(rows).set_index("Stage"))
+
+def display_analytics_overview(summary):
+    """
+    Display the headline gauge and score distribution across many interviews.
+    
+    Args:
+        summary (dict): Output of analytics.overall_summary()
+    """
+    col1, col2 = st.columns(2)
+    col1.metric("Interviews", summary["interviews"])
+    col2.metric("Answers Scored", summary["answers"])
+    
+    heading_style = "font-family:sans-serif; font-size:20px; font-weight:600; margin:0 0 10px 0;"
+    html = f"""
+    <div style="font-family:sans-serif;">
+        <div style="{heading_style}">Average Relevance Score</div>
+        {create_score_gauge(summary["average"])}
+        <div style="{heading_style} margin-top:20px;">Score Distribution</div>
+        {render_score_distribution(summary)}
+    </div>
+    """
+    st.components.v1.html(html, height=300, scrolling=False)
 
 # Example usage (add this to show how to call the function)
 if __name__ == "__main__":